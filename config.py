@@ -6,8 +6,9 @@ Modify these values to customize the appearance of overlaid text.
 """
 
 import os
-from pathlib import Path
 import sys
+from dataclasses import dataclass, fields
+from typing import Optional, Tuple
 
 # Directory settings
 INPUT_DIR = "input"           # Default input directory
@@ -28,6 +29,12 @@ PADDING = 20                   # Pixels from edge of image
 
 # Output settings
 OUTPUT_QUALITY = 95            # JPEG quality (1-100, higher is better)
+QUALITY_KEEP = False           # Reuse each source JPEG's quantization tables instead of OUTPUT_QUALITY
+OPTIMIZE_JPEG = False          # Extra Huffman optimization pass: slightly smaller files, slower saves
+PROGRESSIVE_JPEG = False       # Progressive JPEG output (multi-scan, slower to encode)
+
+# Input settings
+VERIFY_IMAGES = False          # Run a full integrity check on each input before processing
 
 # Coordinate system settings
 SHOW_UTM_COORDINATES = True    # Show UTM coordinates in addition to WGS84
@@ -48,74 +55,210 @@ MAX_WORKERS = 6                # Maximum number of parallel workers for multipro
 # Output safety settings
 FILE_COLLISION_MODE = 'rename' # Options: 'overwrite', 'skip', 'rename'
 
+# Set to "1" to skip validate_config() (only for programmatically generated settings)
+SKIP_VALIDATION_ENV_VAR = 'IMGOVERLAY_SKIP_VALIDATION'
+
+# Named presets: each maps setting names to the values that differ from above.
+# Select one with the IMGOVERLAY_PRESET environment variable.
+PRESET_ENV_VAR = 'IMGOVERLAY_PRESET'
+PRESETS = {
+    'white': {
+        'TEXT_COLOR': (255, 255, 255),
+        'SHOW_UTM_COORDINATES': True,
+    },
+    'red_no_utm': {
+        'TEXT_COLOR': (255, 0, 0),
+        'SHOW_UTM_COORDINATES': False,
+    },
+}
+
+# Signature of the settings that last passed validation (see validate_config)
+_VALIDATED_SIG = None
+
+VALID_POSITIONS = ('top-left', 'top-right', 'bottom-left', 'bottom-right')
+VALID_COLLISION_MODES = ('overwrite', 'skip', 'rename')
+
+
+def _int_between(low, high):
+    """Build a check accepting integers in the inclusive range [low, high]."""
+    return lambda value: isinstance(value, int) and low <= value <= high
+
+
+def _validate_rgb(color, name):
+    """Raise ValueError unless color is an (R, G, B) tuple of integers 0-255."""
+    if type(color) is not tuple or len(color) != 3:
+        raise ValueError(f"{name} must be a tuple of 3 values (R, G, B)")
+    r, g, b = color
+    if not (type(r) is int and type(g) is int and type(b) is int
+            and 0 <= r <= 255 and 0 <= g <= 255 and 0 <= b <= 255):
+        raise ValueError(f"{name} values must be integers between 0 and 255")
+
+
+# Validation schema: (setting name, check, error message), built once at import.
+# RGB settings use _validate_rgb since they report two distinct errors.
+_RGB_SETTINGS = ('TEXT_COLOR', 'OUTLINE_COLOR')
+_SCHEMA = (
+    ('FONT_SIZE', _int_between(1, 500),
+     "FONT_SIZE must be an integer between 1 and 500"),
+    ('OUTLINE_WIDTH', _int_between(0, 20),
+     "OUTLINE_WIDTH must be an integer between 0 and 20"),
+    ('TEXT_POSITION', lambda value: value in VALID_POSITIONS,
+     f"TEXT_POSITION must be one of: {', '.join(VALID_POSITIONS)}"),
+    ('PADDING', lambda value: isinstance(value, int) and value >= 0,
+     "PADDING must be a non-negative integer"),
+    ('OUTPUT_QUALITY', _int_between(1, 100),
+     "OUTPUT_QUALITY must be an integer between 1 and 100"),
+    ('QUALITY_KEEP', lambda value: isinstance(value, bool),
+     "QUALITY_KEEP must be a boolean"),
+    ('OPTIMIZE_JPEG', lambda value: isinstance(value, bool),
+     "OPTIMIZE_JPEG must be a boolean"),
+    ('PROGRESSIVE_JPEG', lambda value: isinstance(value, bool),
+     "PROGRESSIVE_JPEG must be a boolean"),
+    ('VERIFY_IMAGES', lambda value: isinstance(value, bool),
+     "VERIFY_IMAGES must be a boolean"),
+    ('MAX_WORKERS', _int_between(1, 32),
+     "MAX_WORKERS must be an integer between 1 and 32"),
+    ('FILE_COLLISION_MODE', lambda value: value in VALID_COLLISION_MODES,
+     f"FILE_COLLISION_MODE must be one of: {', '.join(VALID_COLLISION_MODES)}"),
+    ('SHOW_UTM_COORDINATES', lambda value: isinstance(value, bool),
+     "SHOW_UTM_COORDINATES must be a boolean"),
+    ('TARGET_EPSG', _int_between(1000, 99999),
+     "TARGET_EPSG must be an integer between 1000 and 99999"),
+    ('UTM_ZONE', _int_between(1, 60),
+     "UTM_ZONE must be an integer between 1 and 60"),
+    ('UTM_HEMISPHERE', lambda value: value in ('N', 'S'),
+     "UTM_HEMISPHERE must be 'N' or 'S'"),
+    ('SHOW_DIRECTION', lambda value: isinstance(value, bool),
+     "SHOW_DIRECTION must be a boolean"),
+    ('DIRECTION_PRECISION', lambda value: value in (8, 16),
+     "DIRECTION_PRECISION must be 8 or 16"),
+    ('PROJECT_INFO', lambda value: value is None or isinstance(value, str),
+     "PROJECT_INFO must be a string or None"),
+)
+_VALIDATED_SETTINGS = _RGB_SETTINGS + tuple(name for name, _, _ in _SCHEMA)
+
 
 def validate_config():
     """
-    Validate configuration values.
+    Validate configuration values against the schema.
     Raises ValueError if any configuration is invalid.
-    """
-    # Validate RGB tuples
-    def validate_rgb(color, name):
-        if not isinstance(color, tuple) or len(color) != 3:
-            raise ValueError(f"{name} must be a tuple of 3 values (R, G, B)")
-        if not all(isinstance(c, int) and 0 <= c <= 255 for c in color):
-            raise ValueError(f"{name} values must be integers between 0 and 255")
-    
-    validate_rgb(TEXT_COLOR, "TEXT_COLOR")
-    validate_rgb(OUTLINE_COLOR, "OUTLINE_COLOR")
-    
-    # Validate font size
-    if not isinstance(FONT_SIZE, int) or FONT_SIZE < 1 or FONT_SIZE > 500:
-        raise ValueError("FONT_SIZE must be an integer between 1 and 500")
-    
-    # Validate outline width
-    if not isinstance(OUTLINE_WIDTH, int) or OUTLINE_WIDTH < 0 or OUTLINE_WIDTH > 20:
-        raise ValueError("OUTLINE_WIDTH must be an integer between 0 and 20")
     
-    # Validate text position
-    valid_positions = ['top-left', 'top-right', 'bottom-left', 'bottom-right']
-    if TEXT_POSITION not in valid_positions:
-        raise ValueError(f"TEXT_POSITION must be one of: {', '.join(valid_positions)}")
+    The result is cached against the current setting objects, so repeated
+    calls return immediately until a setting is reassigned.
     
-    # Validate padding
-    if not isinstance(PADDING, int) or PADDING < 0:
-        raise ValueError("PADDING must be a non-negative integer")
-    
-    # Validate output quality
-    if not isinstance(OUTPUT_QUALITY, int) or OUTPUT_QUALITY < 1 or OUTPUT_QUALITY > 100:
-        raise ValueError("OUTPUT_QUALITY must be an integer between 1 and 100")
+    Validation is skipped entirely when IMGOVERLAY_SKIP_VALIDATION=1. This is
+    only safe when the settings are generated by a program that guarantees
+    valid values; hand-edited settings should always be validated.
+    """
+    global _VALIDATED_SIG
     
-    # Validate max workers
-    if not isinstance(MAX_WORKERS, int) or MAX_WORKERS < 1 or MAX_WORKERS > 32:
-        raise ValueError("MAX_WORKERS must be an integer between 1 and 32")
+    if os.environ.get(SKIP_VALIDATION_ENV_VAR) == "1":
+        return True
     
-    # Validate file collision mode
-    valid_modes = ['overwrite', 'skip', 'rename']
-    if FILE_COLLISION_MODE not in valid_modes:
-        raise ValueError(f"FILE_COLLISION_MODE must be one of: {', '.join(valid_modes)}")
+    settings = globals()
+    sig = tuple(settings[name] for name in _VALIDATED_SETTINGS)
+    # Compare by identity: equal values of another type (1 for True, 96.0
+    # for 96) must not pass as validated. The signature keeps the validated
+    # objects alive, so their identities cannot be reused.
+    if _VALIDATED_SIG is not None and all(
+            value is validated for value, validated in zip(sig, _VALIDATED_SIG)):
+        return True
     
-    # Validate coordinate system settings
-    if not isinstance(SHOW_UTM_COORDINATES, bool):
-        raise ValueError("SHOW_UTM_COORDINATES must be a boolean")
+    for name in _RGB_SETTINGS:
+        _validate_rgb(settings[name], name)
     
-    if not isinstance(TARGET_EPSG, int) or TARGET_EPSG < 1000 or TARGET_EPSG > 99999:
-        raise ValueError("TARGET_EPSG must be an integer between 1000 and 99999")
+    for name, check, message in _SCHEMA:
+        if not check(settings[name]):
+            raise ValueError(message)
     
-    if not isinstance(UTM_ZONE, int) or UTM_ZONE < 1 or UTM_ZONE > 60:
-        raise ValueError("UTM_ZONE must be an integer between 1 and 60")
+    _VALIDATED_SIG = sig
+    return True
+
+
+# slots=True is only available on Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
+class Config:
+    """
+    Immutable snapshot of the settings above, with lowercase field names.
     
-    if UTM_HEMISPHERE not in ['N', 'S']:
-        raise ValueError("UTM_HEMISPHERE must be 'N' or 'S'")
+    Built by load_config() once command-line overrides have been applied;
+    per-image code reads its settings from CONFIG instead of the module.
+    """
+    input_dir: str
+    output_dir: str
+    text_color: Tuple[int, int, int]
+    outline_color: Tuple[int, int, int]
+    outline_width: int
+    font_size: int
+    font_path: str
+    text_position: str
+    padding: int
+    output_quality: int
+    quality_keep: bool
+    optimize_jpeg: bool
+    progressive_jpeg: bool
+    verify_images: bool
+    show_utm_coordinates: bool
+    target_epsg: int
+    utm_zone: int
+    utm_hemisphere: str
+    show_direction: bool
+    direction_precision: int
+    project_info: Optional[str]
+    max_workers: int
+    file_collision_mode: str
+
+
+def load_config() -> Config:
+    """
+    Snapshot the current module-level settings into CONFIG.
+    Call again after changing any setting (e.g. applying CLI overrides).
     
-    # Validate direction settings
-    if not isinstance(SHOW_DIRECTION, bool):
-        raise ValueError("SHOW_DIRECTION must be a boolean")
+    Returns:
+        The new Config instance
+    """
+    global CONFIG
+    settings = globals()
+    CONFIG = Config(**{field.name: settings[field.name.upper()] for field in fields(Config)})
+    return CONFIG
+
+
+def use_config(config_snapshot: Config) -> None:
+    """
+    Make config_snapshot the active CONFIG.
+    Used by worker processes to adopt the parent's settings (including CLI
+    overrides), e.g. as a process pool initializer.
     
-    if DIRECTION_PRECISION not in [8, 16]:
-        raise ValueError("DIRECTION_PRECISION must be 8 or 16")
+    Args:
+        config_snapshot: Config built by load_config() in the parent process
+    """
+    global CONFIG
+    CONFIG = config_snapshot
+
+
+def apply_preset(name: str) -> Config:
+    """
+    Apply a named preset from PRESETS to the module-level settings.
+    The resulting settings are validated and snapshotted into CONFIG.
     
-    # Validate project info
-    if PROJECT_INFO is not None and not isinstance(PROJECT_INFO, str):
-        raise ValueError("PROJECT_INFO must be a string or None")
+    Args:
+        name: Preset name (a key of PRESETS)
+        
+    Returns:
+        The new Config instance
+        
+    Raises:
+        ValueError: If the preset is unknown or yields invalid settings
+    """
+    if name not in PRESETS:
+        raise ValueError(f"Unknown preset '{name}'. Available presets: {', '.join(PRESETS)}")
     
-    return True
+    globals().update(PRESETS[name])
+    validate_config()
+    return load_config()
+
+
+CONFIG = load_config()
@@ -4,14 +4,74 @@ EXIF Metadata Extraction Module
 Extracts DateTime and GPS location data from JPG image EXIF metadata.
 """
 
-import piexif
+import os
+import math
+import struct
 import logging
-from typing import Optional, Tuple, Dict
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Optional, Tuple, List
 from pyproj import Transformer
 import config
 
-# Cache for coordinate transformers (one per process)
-_transformer_cache: Dict[int, Transformer] = {}
+# EXIF tag IDs (same values as piexif.ImageIFD / piexif.GPSIFD)
+_TAG_DATETIME = 0x0132      # 0th IFD: DateTime
+_TAG_GPS_IFD = 0x8825       # 0th IFD: pointer to the GPS IFD
+_TAG_LAT_REF = 0x0001       # GPS IFD: GPSLatitudeRef
+_TAG_LAT = 0x0002           # GPS IFD: GPSLatitude
+_TAG_LON_REF = 0x0003       # GPS IFD: GPSLongitudeRef
+_TAG_LON = 0x0004           # GPS IFD: GPSLongitude
+_TAG_ALT_REF = 0x0005       # GPS IFD: GPSAltitudeRef
+_TAG_ALT = 0x0006           # GPS IFD: GPSAltitude
+_TAG_IMG_DIR_REF = 0x0010   # GPS IFD: GPSImgDirectionRef
+_TAG_IMG_DIR = 0x0011       # GPS IFD: GPSImgDirection
+
+# GPS tags that must all be present to compute a location
+_GPS_REQUIRED_TAGS = (_TAG_LAT, _TAG_LAT_REF, _TAG_LON, _TAG_LON_REF)
+
+# TIFF field type -> (struct format character, size in bytes)
+_TIFF_FIELD_TYPES = {
+    1: ('B', 1),   # BYTE
+    2: ('s', 1),   # ASCII
+    3: ('H', 2),   # SHORT
+    4: ('L', 4),   # LONG
+    5: ('L', 8),   # RATIONAL (two LONGs)
+    9: ('l', 4),   # SLONG
+    10: ('l', 8),  # SRATIONAL (two SLONGs)
+}
+
+# Hemisphere letters indexed by is_latitude * 2 + (value < 0)
+_DIRS = ('E', 'W', 'N', 'S')
+
+# Compass sectors clockwise from North, indexed by degrees_to_cardinal
+_DIR8 = ('N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW')
+_DIR16 = (
+    'N', 'NNE', 'NE', 'ENE',
+    'E', 'ESE', 'SE', 'SSE',
+    'S', 'SSW', 'SW', 'WSW',
+    'W', 'WNW', 'NW', 'NNW'
+)
+
+# Ellipsoids (semi-major axis in metres, flattening) of the UTM systems
+# projected in closed form by utm_forward
+_WGS84_ELLIPSOID = (6378137.0, 1 / 298.257223563)
+_GRS80_ELLIPSOID = (6378137.0, 1 / 298.257222101)
+
+# UTM EPSG code ranges: first code (zone 1 or first zone), zones, hemisphere, ellipsoid
+_UTM_EPSG_RANGES = (
+    (32601, 1, 60, False, _WGS84_ELLIPSOID),   # WGS 84 / UTM zone 1N-60N
+    (32701, 1, 60, True, _WGS84_ELLIPSOID),    # WGS 84 / UTM zone 1S-60S
+    (25828, 28, 38, False, _GRS80_ELLIPSOID),  # ETRS89 / UTM zone 28N-38N
+)
+
+# Farthest longitude from the central meridian handled by the Krüger series
+# (accurate to well below a millimetre there); beyond it pyproj is used
+_UTM_SERIES_MAX_OFFSET = 30.0
+
+_UTM_SCALE = 0.9996
+_UTM_FALSE_EASTING = 500000.0
+_UTM_FALSE_NORTHING_SOUTH = 10000000.0
 
 
 def rational_to_decimal(rational: Tuple[Tuple[int, int], ...]) -> float:
@@ -35,15 +95,39 @@ def rational_to_decimal(rational: Tuple[Tuple[int, int], ...]) -> float:
         if denom == 0:
             raise ValueError(f"Invalid GPS rational: zero denominator at position {i}")
     
-    degrees = rational[0][0] / rational[0][1]
-    minutes = rational[1][0] / rational[1][1]
-    seconds = rational[2][0] / rational[2][1]
+    (n0, d0), (n1, d1), (n2, d2) = rational
+    # Degrees + minutes/60 + seconds/3600, as a single expression
+    return n0 / d0 + n1 / (d1 * 60.0) + n2 / (d2 * 3600.0)
+
+
+def rational_to_decimal_batch(rationals):
+    """
+    Convert many GPS rational coordinates to decimal degrees at once.
     
-    # Constants for clarity
-    MINUTES_PER_DEGREE = 60.0
-    SECONDS_PER_DEGREE = 3600.0
+    Vectorized counterpart of rational_to_decimal for batch pipelines.
     
-    return degrees + (minutes / MINUTES_PER_DEGREE) + (seconds / SECONDS_PER_DEGREE)
+    Args:
+        rationals: Array-like of shape (N, 3, 2) holding (numerator, denominator)
+                   pairs for degrees, minutes, seconds of N coordinates
+        
+    Returns:
+        NumPy array of N decimal degree values
+        
+    Raises:
+        ValueError: If the array shape is invalid or contains zero denominators
+    """
+    import numpy as np
+    
+    r = np.asarray(rationals, dtype=np.int64)
+    if r.ndim != 3 or r.shape[1:] != (3, 2):
+        raise ValueError(f"Invalid GPS rational batch: expected shape (N, 3, 2), got {r.shape}")
+    
+    if (r[:, :, 1] == 0).any():
+        raise ValueError("Invalid GPS rational batch: zero denominator present")
+    
+    return (r[:, 0, 0] / r[:, 0, 1]
+            + r[:, 1, 0] / (r[:, 1, 1] * 60.0)
+            + r[:, 2, 0] / (r[:, 2, 1] * 3600.0))
 
 
 def decimal_to_dms(decimal: float, is_latitude: bool) -> str:
@@ -57,18 +141,12 @@ def decimal_to_dms(decimal: float, is_latitude: bool) -> str:
     Returns:
         Human-readable coordinate string (e.g., "40°42'46\"N")
     """
-    is_positive = decimal >= 0
-    decimal = abs(decimal)
+    # Work in whole arcseconds to avoid accumulating float error
+    total_seconds = int(round(abs(decimal) * 3600))
+    degrees, remainder = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
     
-    degrees = int(decimal)
-    minutes_decimal = (decimal - degrees) * 60
-    minutes = int(minutes_decimal)
-    seconds = int((minutes_decimal - minutes) * 60)
-    
-    if is_latitude:
-        direction = 'N' if is_positive else 'S'
-    else:
-        direction = 'E' if is_positive else 'W'
+    direction = _DIRS[is_latitude * 2 + (decimal < 0)]
     
     return f"{degrees}°{minutes}'{seconds}\"{direction}"
 
@@ -91,27 +169,17 @@ def degrees_to_cardinal(degrees: float, precision: int = 8) -> str:
     
     if precision == 16:
         # 16-sector compass (22.5° per sector)
-        directions = [
-            'N', 'NNE', 'NE', 'ENE',
-            'E', 'ESE', 'SE', 'SSE',
-            'S', 'SSW', 'SW', 'WSW',
-            'W', 'WNW', 'NW', 'NNW'
-        ]
-        sector_size = 360 / 16
-        index = int((degrees + sector_size / 2) % 360 / sector_size)
-    else:
-        # 8-sector compass (45° per sector) - default
-        directions = ['N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW']
-        sector_size = 360 / 8
-        index = int((degrees + sector_size / 2) % 360 / sector_size)
-    
-    return directions[index]
+        return _DIR16[int(degrees * 16 / 360 + 0.5) & 15]
+    # 8-sector compass (45° per sector) - default
+    return _DIR8[int(degrees * 8 / 360 + 0.5) & 7]
 
 
+@lru_cache(maxsize=16)
 def get_transformer(target_epsg: int) -> Transformer:
     """
     Get or create a cached coordinate transformer.
-    Uses a cache to avoid recreating transformers for each image.
+    Transformers are cached per process (bounded LRU, safe to call from
+    worker threads) to avoid recreating them for each image.
     
     Args:
         target_epsg: Target EPSG code
@@ -119,19 +187,187 @@ def get_transformer(target_epsg: int) -> Transformer:
     Returns:
         Transformer object for WGS84 to target CRS
     """
-    if target_epsg not in _transformer_cache:
-        _transformer_cache[target_epsg] = Transformer.from_crs(
-            "EPSG:4326",  # WGS84 (GPS standard)
-            f"EPSG:{target_epsg}",
-            always_xy=True  # Ensure longitude, latitude order
-        )
-        logging.debug(f"Created transformer for EPSG:{target_epsg}")
-    return _transformer_cache[target_epsg]
+    transformer = Transformer.from_crs(
+        "EPSG:4326",  # WGS84 (GPS standard)
+        f"EPSG:{target_epsg}",
+        always_xy=True  # Ensure longitude, latitude order
+    )
+    logging.debug(f"Created transformer for EPSG:{target_epsg}")
+    return transformer
+
+
+def _utm_projection(target_epsg: int) -> Optional[Tuple[int, bool, Tuple[float, float]]]:
+    """
+    Look up the UTM zone, hemisphere and ellipsoid of a UTM EPSG code.
+    
+    Args:
+        target_epsg: Target EPSG code
+        
+    Returns:
+        Tuple of (zone, is_south, ellipsoid), or None if not a supported UTM code
+    """
+    for first_code, first_zone, last_zone, south, ellipsoid in _UTM_EPSG_RANGES:
+        zone = target_epsg - first_code + first_zone
+        if first_zone <= zone <= last_zone:
+            return zone, south, ellipsoid
+    return None
+
+
+def _central_meridian_offset(lon: float, zone: int) -> float:
+    """Longitude relative to the zone's central meridian, in [-180, 180)."""
+    return (lon - (zone * 6 - 183) + 180.0) % 360.0 - 180.0
+
+
+@lru_cache(maxsize=4)
+def _kruger_coefficients(ellipsoid: Tuple[float, float]) -> Tuple[float, float, Tuple[float, ...]]:
+    """
+    Compute the 6th-order Krüger series constants for an ellipsoid.
+    
+    Args:
+        ellipsoid: Tuple of (semi-major axis, flattening)
+        
+    Returns:
+        Tuple of (eccentricity, scaled rectifying radius, alpha coefficients)
+    """
+    a, f = ellipsoid
+    n = f / (2 - f)
+    n2, n3, n4, n5, n6 = n ** 2, n ** 3, n ** 4, n ** 5, n ** 6
+    radius = _UTM_SCALE * a / (1 + n) * (1 + n2 / 4 + n4 / 64 + n6 / 256)
+    alpha = (
+        n / 2 - 2 * n2 / 3 + 5 * n3 / 16 + 41 * n4 / 180 - 127 * n5 / 288 + 7891 * n6 / 37800,
+        13 * n2 / 48 - 3 * n3 / 5 + 557 * n4 / 1440 + 281 * n5 / 630 - 1983433 * n6 / 1935360,
+        61 * n3 / 240 - 103 * n4 / 140 + 15061 * n5 / 26880 + 167603 * n6 / 181440,
+        49561 * n4 / 161280 - 179 * n5 / 168 + 6601661 * n6 / 7257600,
+        34729 * n5 / 80640 - 3418889 * n6 / 1995840,
+        212378941 * n6 / 319334400,
+    )
+    return math.sqrt(f * (2 - f)), radius, alpha
+
+
+def utm_forward(lat: float, lon: float, zone: int, south: bool = False,
+                ellipsoid: Tuple[float, float] = _WGS84_ELLIPSOID) -> Tuple[float, float]:
+    """
+    Project geographic coordinates to UTM with the Krüger series (Karney 2011).
+    
+    Closed-form alternative to a PROJ pipeline for a known UTM target; accurate
+    to well below a millimetre within _UTM_SERIES_MAX_OFFSET of the central
+    meridian.
+    
+    Args:
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+        zone: UTM zone number (1-60)
+        south: True for the southern hemisphere (10,000 km false northing)
+        ellipsoid: Tuple of (semi-major axis, flattening)
+        
+    Returns:
+        Tuple of (easting, northing) in metres
+    """
+    e, radius, alpha = _kruger_coefficients(ellipsoid)
+    phi = math.radians(lat)
+    lam = math.radians(_central_meridian_offset(lon, zone))
+    
+    # Conformal latitude
+    sin_phi = math.sin(phi)
+    tau = math.tan(phi)
+    sigma = math.sinh(e * math.atanh(e * sin_phi))
+    tau_c = tau * math.sqrt(1 + sigma * sigma) - sigma * math.sqrt(1 + tau * tau)
+    
+    cos_lam = math.cos(lam)
+    xi_c = math.atan2(tau_c, cos_lam)
+    eta_c = math.asinh(math.sin(lam) / math.sqrt(tau_c * tau_c + cos_lam * cos_lam))
+    
+    xi, eta = xi_c, eta_c
+    for j, alpha_j in enumerate(alpha, start=1):
+        xi += alpha_j * math.sin(2 * j * xi_c) * math.cosh(2 * j * eta_c)
+        eta += alpha_j * math.cos(2 * j * xi_c) * math.sinh(2 * j * eta_c)
+    
+    easting = _UTM_FALSE_EASTING + radius * eta
+    northing = radius * xi + (_UTM_FALSE_NORTHING_SOUTH if south else 0.0)
+    return easting, northing
+
+
+def utm_forward_batch(lats, lons, zone: int, south: bool = False,
+                      ellipsoid: Tuple[float, float] = _WGS84_ELLIPSOID):
+    """
+    Vectorized counterpart of utm_forward for NumPy arrays.
+    
+    Args:
+        lats: Latitudes in decimal degrees (array-like)
+        lons: Longitudes in decimal degrees (array-like)
+        zone: UTM zone number (1-60)
+        south: True for the southern hemisphere
+        ellipsoid: Tuple of (semi-major axis, flattening)
+        
+    Returns:
+        Tuple of (eastings, northings) NumPy arrays in metres
+    """
+    import numpy as np
+    
+    e, radius, alpha = _kruger_coefficients(ellipsoid)
+    phi = np.radians(np.asarray(lats, dtype=np.float64))
+    lam = np.radians((np.asarray(lons, dtype=np.float64) - (zone * 6 - 183) + 180.0) % 360.0 - 180.0)
+    
+    tau = np.tan(phi)
+    sigma = np.sinh(e * np.arctanh(e * np.sin(phi)))
+    tau_c = tau * np.sqrt(1 + sigma * sigma) - sigma * np.sqrt(1 + tau * tau)
+    
+    cos_lam = np.cos(lam)
+    xi_c = np.arctan2(tau_c, cos_lam)
+    eta_c = np.arcsinh(np.sin(lam) / np.sqrt(tau_c * tau_c + cos_lam * cos_lam))
+    
+    xi = xi_c.copy()
+    eta = eta_c.copy()
+    for j, alpha_j in enumerate(alpha, start=1):
+        xi += alpha_j * np.sin(2 * j * xi_c) * np.cosh(2 * j * eta_c)
+        eta += alpha_j * np.cos(2 * j * xi_c) * np.sinh(2 * j * eta_c)
+    
+    eastings = _UTM_FALSE_EASTING + radius * eta
+    northings = radius * xi + (_UTM_FALSE_NORTHING_SOUTH if south else 0.0)
+    return eastings, northings
+
+
+def transform_to_utm_batch(lats: array, lons: array, target_epsg: int):
+    """
+    Transform many WGS84 coordinates to the target coordinate system at once.
+    
+    UTM targets are projected in one vectorized Krüger series evaluation;
+    other targets (and points far from the zone) use a single PROJ call on
+    arrays, which avoids the per-call overhead that dominates scalar transforms.
+    
+    Args:
+        lats: Latitudes in decimal degrees (WGS84), as array('d')
+        lons: Longitudes in decimal degrees (WGS84), as array('d')
+        target_epsg: Target EPSG code
+        
+    Returns:
+        Tuple of (eastings, northings) arrays in target coordinate system
+    """
+    utm = _utm_projection(target_epsg)
+    if utm is None:
+        return get_transformer(target_epsg).transform(lons, lats)
+    
+    import numpy as np
+    
+    zone, south, ellipsoid = utm
+    lat_values = np.asarray(lats, dtype=np.float64)
+    lon_values = np.asarray(lons, dtype=np.float64)
+    eastings, northings = utm_forward_batch(lat_values, lon_values, zone, south, ellipsoid)
+    
+    offsets = (lon_values - (zone * 6 - 183) + 180.0) % 360.0 - 180.0
+    far = np.abs(offsets) > _UTM_SERIES_MAX_OFFSET
+    if far.any():
+        far_e, far_n = get_transformer(target_epsg).transform(lon_values[far], lat_values[far])
+        eastings[far] = far_e
+        northings[far] = far_n
+    return eastings, northings
 
 
 def transform_to_utm(lat_decimal: float, lon_decimal: float, target_epsg: int) -> Tuple[float, float]:
     """
     Transform WGS84 coordinates to target coordinate system.
+    UTM targets are projected in closed form (see utm_forward); other
+    targets go through a cached pyproj Transformer.
     
     Args:
         lat_decimal: Latitude in decimal degrees (WGS84)
@@ -141,6 +377,12 @@ def transform_to_utm(lat_decimal: float, lon_decimal: float, target_epsg: int) -
     Returns:
         Tuple of (easting, northing) in target coordinate system
     """
+    utm = _utm_projection(target_epsg)
+    if utm is not None:
+        zone, south, ellipsoid = utm
+        if abs(_central_meridian_offset(lon_decimal, zone)) <= _UTM_SERIES_MAX_OFFSET:
+            return utm_forward(lat_decimal, lon_decimal, zone, south, ellipsoid)
+    
     transformer = get_transformer(target_epsg)
     # Transform: lon, lat (X, Y) -> easting, northing
     easting, northing = transformer.transform(lon_decimal, lat_decimal)
@@ -163,148 +405,493 @@ def format_utm_coordinates(easting: float, northing: float, zone: int, hemispher
     return f"UTM {zone}{hemisphere}: {easting:.2f}E, {northing:.2f}N"
 
 
-def extract_exif_data(image_path: str, filename: str = None) -> dict:
+def _read_exif_segment(image_path: str) -> Optional[bytes]:
+    """
+    Read only the TIFF payload of the Exif APP1 segment from a JPEG file.
+    
+    Walks the JPEG marker headers from the start of the file, seeking past
+    every other segment, and stops at the start of the image data.
+    
+    Args:
+        image_path: Path to the JPG image file
+        
+    Returns:
+        TIFF header and IFDs as bytes, or None if the file has no Exif segment
+        
+    Raises:
+        ValueError: If the file is not a JPEG
+    """
+    with open(image_path, 'rb') as f:
+        if f.read(2) != b'\xff\xd8':
+            raise ValueError("File is not a JPEG image")
+        
+        while True:
+            header = f.read(4)
+            if len(header) < 4 or header[0] != 0xFF:
+                return None
+            marker = header[1]
+            # Start of scan / end of image: no metadata segments follow
+            if marker in (0xDA, 0xD9):
+                return None
+            
+            length = struct.unpack('>H', header[2:])[0]
+            if marker == 0xE1:
+                segment = f.read(length - 2)
+                if segment[:6] == b'Exif\x00\x00':
+                    return segment[6:]
+            else:
+                f.seek(length - 2, os.SEEK_CUR)
+
+
+def _parse_ifd(tiff: bytes, offset: int, byte_order: str, tags: Optional[set] = None) -> dict:
+    """
+    Decode the entries of one TIFF IFD into piexif-style values.
+    
+    ASCII fields become bytes without the trailing NUL, RATIONAL fields become
+    (numerator, denominator) tuples and single-count numbers become ints.
+    Fields of unsupported types (e.g. UNDEFINED) are skipped.
+    
+    Args:
+        tiff: TIFF payload of the Exif segment
+        offset: Offset of the IFD within the payload
+        byte_order: struct byte order prefix ('<' or '>')
+        tags: Tag IDs to decode (default: all tags)
+        
+    Returns:
+        Dictionary mapping tag ID to decoded value
+    """
+    entries = {}
+    count = struct.unpack_from(byte_order + 'H', tiff, offset)[0]
+    
+    for i in range(count):
+        pos = offset + 2 + 12 * i
+        tag, field_type, value_count = struct.unpack_from(byte_order + 'HHL', tiff, pos)
+        if (tags is not None and tag not in tags) or field_type not in _TIFF_FIELD_TYPES:
+            continue
+        
+        fmt, size = _TIFF_FIELD_TYPES[field_type]
+        total = size * value_count
+        # Values of up to 4 bytes are stored inline, larger ones at an offset
+        if total <= 4:
+            data_pos = pos + 8
+        else:
+            data_pos = struct.unpack_from(byte_order + 'L', tiff, pos + 8)[0]
+        raw = tiff[data_pos:data_pos + total]
+        if len(raw) < total:
+            raise ValueError(f"Truncated EXIF value for tag 0x{tag:04X}")
+        
+        if field_type == 2:
+            entries[tag] = raw.rstrip(b'\x00')
+        elif field_type in (5, 10):
+            values = struct.unpack(byte_order + fmt * (2 * value_count), raw)
+            pairs = tuple(zip(values[::2], values[1::2]))
+            entries[tag] = pairs[0] if value_count == 1 else pairs
+        else:
+            values = struct.unpack(byte_order + fmt * value_count, raw)
+            entries[tag] = values[0] if value_count == 1 else values
+    
+    return entries
+
+
+def _load_exif_tags(image_path: str) -> dict:
+    """
+    Load the DateTime tag and GPS IFD from a JPEG's EXIF data.
+    
+    A targeted replacement for piexif.load that reads only the Exif APP1
+    segment and decodes only the IFDs we use, skipping the Exif, Interop and
+    thumbnail IFDs entirely.
+    
+    Args:
+        image_path: Path to the JPG image file
+        
+    Returns:
+        Dictionary shaped like piexif.load output, with '0th' and (if present)
+        'GPS' keys; empty if the image has no EXIF data
+        
+    Raises:
+        ValueError: If the file is not a JPEG or the EXIF data is malformed
+    """
+    return parse_exif_bytes(_read_exif_segment(image_path))
+
+
+def parse_exif_bytes(exif_bytes: Optional[bytes]) -> dict:
+    """
+    Decode the DateTime tag and GPS IFD from raw EXIF bytes.
+    
+    Lets callers that already hold the EXIF payload (e.g. Pillow's
+    image.info['exif']) skip reading the file again.
+    
+    Args:
+        exif_bytes: TIFF header and IFDs, optionally prefixed with the
+                    Exif APP1 identifier (may be None)
+        
+    Returns:
+        Dictionary shaped like piexif.load output, with '0th' and (if present)
+        'GPS' keys; empty if there is no EXIF data
+        
+    Raises:
+        ValueError: If the EXIF data is malformed
+    """
+    tiff = exif_bytes
+    if tiff and tiff[:6] == b'Exif\x00\x00':
+        tiff = tiff[6:]
+    if not tiff:
+        return {}
+    
+    if tiff[:2] == b'II':
+        byte_order = '<'
+    elif tiff[:2] == b'MM':
+        byte_order = '>'
+    else:
+        raise ValueError("Invalid TIFF byte order in EXIF data")
+    
+    try:
+        magic, ifd0_offset = struct.unpack_from(byte_order + 'HL', tiff, 2)
+        if magic != 42:
+            raise ValueError("Invalid TIFF header in EXIF data")
+        
+        ifd0 = _parse_ifd(tiff, ifd0_offset, byte_order,
+                          {_TAG_DATETIME, _TAG_GPS_IFD})
+        exif_dict = {'0th': ifd0}
+        if _TAG_GPS_IFD in ifd0:
+            exif_dict['GPS'] = _parse_ifd(tiff, ifd0[_TAG_GPS_IFD], byte_order)
+    except struct.error as e:
+        raise ValueError(f"Truncated EXIF data: {e}") from e
+    
+    return exif_dict
+
+
+def extract_exif_data(image_path: str, filename: str = None, exif_dict: dict = None,
+                      transform_utm: bool = True, convert_gps: bool = True) -> dict:
     """
     Extract EXIF metadata from a JPG image.
     
+    Results are memoized per (path, modification time, size), so repeated
+    calls for an unchanged file skip re-parsing its EXIF data. Overwriting
+    the file changes its mtime/size and invalidates the entry.
+    
     Args:
         image_path: Path to the JPG image file
         filename: Filename to include in metadata (optional)
+        exif_dict: Already loaded EXIF dictionary for the image, e.g. from
+                   parse_exif_bytes (optional); when given the file is not
+                   read again
+        transform_utm: Add 'location_utm' when enabled in config (set False
+                       to transform a whole batch later in one call)
+        convert_gps: Convert GPS rationals to decimal degrees (set False to
+                     convert a whole batch later, see _read_exif_data)
+        
+    Returns:
+        A fresh metadata dictionary (see _read_exif_data for the keys)
+    """
+    if exif_dict is not None:
+        return _read_exif_data(image_path, filename, exif_dict, transform_utm, convert_gps)
+    
+    try:
+        st = os.stat(image_path)
+    except OSError:
+        # Let the uncached reader log the appropriate error
+        return _read_exif_data(image_path, filename, transform_utm=transform_utm,
+                               convert_gps=convert_gps)
+    
+    cfg = config.CONFIG
+    utm_settings = (cfg.show_utm_coordinates, cfg.target_epsg,
+                    cfg.utm_zone, cfg.utm_hemisphere)
+    # Copy so callers can annotate the result without corrupting the cache
+    return dict(_extract_cached(image_path, st.st_mtime_ns, st.st_size,
+                                filename, utm_settings, transform_utm, convert_gps))
+
+
+def extract_exif_data_batch(paths: List[str], filenames: Optional[List[str]] = None,
+                            max_workers: Optional[int] = None,
+                            use_processes: bool = False,
+                            exif_dicts: Optional[List[Optional[dict]]] = None) -> List[dict]:
+    """
+    Extract EXIF metadata from many JPG images concurrently.
+    
+    By default a thread pool overlaps the file reads, which dominate EXIF
+    extraction. With use_processes=True the batch is spread over worker
+    processes instead, in chunks sized to keep pickling overhead low; this
+    scales parsing across cores for large batches. When the EXIF data is
+    already loaded (exif_dicts) nothing is read and no pool is used. GPS
+    coordinates of the whole batch are then converted, and projected to UTM,
+    in single vectorized calls. Results are returned in the same order as paths.
+    
+    Args:
+        paths: Paths to the JPG image files
+        filenames: Filenames to include in each metadata dict (optional,
+                   must match the length of paths)
+        max_workers: Number of threads/processes (default: config.CONFIG.max_workers)
+        use_processes: Use a process pool instead of a thread pool
+        exif_dicts: Already loaded EXIF dictionary per path, e.g. from
+                    parse_exif_bytes (optional, must match the length of
+                    paths); None entries are read from their file
+        
+    Returns:
+        List of metadata dictionaries, one per path
+    """
+    if filenames is None:
+        filenames = [None] * len(paths)
+    elif len(filenames) != len(paths):
+        raise ValueError("filenames must have the same length as paths")
+    
+    if max_workers is None:
+        max_workers = config.CONFIG.max_workers
+    
+    extract = partial(extract_exif_data, transform_utm=False, convert_gps=False)
+    if exif_dicts is not None:
+        if len(exif_dicts) != len(paths):
+            raise ValueError("exif_dicts must have the same length as paths")
+        results = [extract(path, filename, exif_dict)
+                   for path, filename, exif_dict in zip(paths, filenames, exif_dicts)]
+    elif not use_processes:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(extract, paths, filenames))
+    else:
+        # Roughly four chunks per worker balances load against IPC overhead
+        chunksize = max(1, len(paths) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=config.use_config,
+                                 initargs=(config.CONFIG,)) as executor:
+            results = list(executor.map(extract, paths, filenames, chunksize=chunksize))
+    
+    _add_gps_coordinates(results, paths)
+    _add_utm_coordinates(results)
+    return results
+
+
+def _set_location(result: dict, lat_decimal: float, lon_decimal: float) -> None:
+    """Fill 'location', 'latitude' and 'longitude' of a metadata dict."""
+    lat_str = decimal_to_dms(lat_decimal, is_latitude=True)
+    lon_str = decimal_to_dms(lon_decimal, is_latitude=False)
+    result['location'] = f"{lat_str}, {lon_str}"
+    result['latitude'] = lat_decimal
+    result['longitude'] = lon_decimal
+
+
+def _add_gps_coordinates(results: List[dict], paths: List[str]) -> None:
+    """
+    Convert the '_gps_rationals' left by convert_gps=False, in place.
+    All coordinates of the batch are converted with one vectorized call;
+    a batch with malformed rationals falls back to per-image conversion so
+    only the affected images lose their location.
+    """
+    pending = [(result, path) for result, path in zip(results, paths)
+               if '_gps_rationals' in result]
+    if not pending:
+        return
+    
+    raw = [result.pop('_gps_rationals') for result, _ in pending]
+    try:
+        import numpy as np
+        
+        lats = rational_to_decimal_batch([gps[0] for gps in raw])
+        lons = rational_to_decimal_batch([gps[1] for gps in raw])
+        lats = np.where([gps[2] for gps in raw], -lats, lats).tolist()
+        lons = np.where([gps[3] for gps in raw], -lons, lons).tolist()
+    except (ValueError, TypeError, OverflowError):
+        for (result, path), (lat_rational, lon_rational, south, west) in zip(pending, raw):
+            try:
+                lat_decimal = rational_to_decimal(lat_rational)
+                lon_decimal = rational_to_decimal(lon_rational)
+            except ValueError as e:
+                logging.warning(f"Invalid GPS data in {path}: {e}")
+                continue
+            except (KeyError, IndexError, TypeError) as e:
+                logging.warning(f"Error parsing GPS coordinates from {path}: {e}")
+                continue
+            _set_location(result, -lat_decimal if south else lat_decimal,
+                          -lon_decimal if west else lon_decimal)
+        return
+    
+    for (result, _), lat_decimal, lon_decimal in zip(pending, lats, lons):
+        _set_location(result, lat_decimal, lon_decimal)
+
+
+def _add_utm_coordinates(results: List[dict]) -> None:
+    """
+    Add 'location_utm' to every result with GPS coordinates, in place.
+    All coordinates are transformed with one call (if UTM is enabled).
+    """
+    cfg = config.CONFIG
+    if not cfg.show_utm_coordinates:
+        return
+    
+    located = [result for result in results if result.get('latitude') is not None]
+    if not located:
+        return
+    
+    lats = array('d', (result['latitude'] for result in located))
+    lons = array('d', (result['longitude'] for result in located))
+    try:
+        eastings, northings = transform_to_utm_batch(lats, lons, cfg.target_epsg)
+    except Exception as e:
+        logging.warning(f"Failed to transform coordinates for batch: {e}")
+        for result in located:
+            result['location_utm'] = None
+        return
+    
+    for result, easting, northing in zip(located, eastings, northings):
+        result['location_utm'] = format_utm_coordinates(
+            easting, northing, cfg.utm_zone, cfg.utm_hemisphere
+        )
+
+
+@lru_cache(maxsize=4096)
+def _extract_cached(image_path: str, mtime_ns: int, size: int, filename: str,
+                    utm_settings: tuple, transform_utm: bool, convert_gps: bool) -> dict:
+    """
+    Cached wrapper around _read_exif_data.
+    
+    mtime_ns, size and utm_settings are only part of the cache key; they make
+    sure a modified file or changed UTM configuration is parsed again.
+    """
+    return _read_exif_data(image_path, filename, transform_utm=transform_utm,
+                           convert_gps=convert_gps)
+
+
+def _decode(value) -> Optional[str]:
+    """
+    Decode an EXIF ASCII field without raising.
+    
+    EXIF text is ASCII by spec; decoding as UTF-8 (a superset) with
+    errors='replace' also copes with odd writers. Strings are returned
+    unchanged and any other (malformed) value as None.
+    """
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'replace')
+    return value if isinstance(value, str) else None
+
+
+def _read_exif_data(image_path: str, filename: str = None, exif_dict: dict = None,
+                    transform_utm: bool = True, convert_gps: bool = True) -> dict:
+    """
+    Extract EXIF metadata from a JPG image without caching.
+    
+    Args:
+        image_path: Path to the JPG image file
+        filename: Filename to include in metadata (optional)
+        exif_dict: Already loaded EXIF dictionary (optional, read from
+                   image_path when omitted)
+        transform_utm: Add 'location_utm' when enabled in config
+        convert_gps: Convert GPS coordinates; when False the raw rationals are
+                     stored under '_gps_rationals' instead of filling
+                     'location'/'latitude'/'longitude' (and no UTM is added)
         
     Returns:
         Dictionary containing:
         - 'filename': Filename (or None)
         - 'datetime': Date and time string (or None)
         - 'location': Human-readable GPS coordinates (or None)
+        - 'latitude', 'longitude': WGS84 decimal degrees (or None)
         - 'altitude': Altitude in meters (or None)
         - 'direction': Image direction in degrees (or None)
+        - 'location_utm': Formatted UTM coordinates (only with GPS and UTM enabled)
     """
     result = {
         'filename': filename,
         'datetime': None,
         'location': None,
+        'latitude': None,
+        'longitude': None,
         'altitude': None,
         'direction': None
     }
     
     try:
-        exif_dict = piexif.load(image_path)
+        if exif_dict is None:
+            exif_dict = _load_exif_tags(image_path)
+        
+        zeroth = exif_dict.get('0th') or {}
+        gps_data = exif_dict.get('GPS')
+        
+        # EXIF-less images (common in web/stock datasets): nothing to parse
+        if not gps_data and _TAG_DATETIME not in zeroth:
+            return result
         
         # Extract DateTime
-        if '0th' in exif_dict and piexif.ImageIFD.DateTime in exif_dict['0th']:
-            try:
-                datetime_bytes = exif_dict['0th'][piexif.ImageIFD.DateTime]
-                # Try UTF-8 first, with fallback to latin-1
-                try:
-                    result['datetime'] = datetime_bytes.decode('utf-8')
-                except UnicodeDecodeError:
-                    result['datetime'] = datetime_bytes.decode('latin-1', errors='replace')
-                    logging.debug(f"Used latin-1 encoding for datetime in {image_path}")
-            except (AttributeError, UnicodeDecodeError) as e:
-                logging.warning(f"Could not decode datetime from {image_path}: {e}")
-        
-        # Extract GPS coordinates
-        if 'GPS' in exif_dict:
-            gps_data = exif_dict['GPS']
+        if _TAG_DATETIME in zeroth:
+            result['datetime'] = _decode(zeroth[_TAG_DATETIME])
+        
+        # Photos without a GPS fix are common: return before any GPS parsing
+        if not gps_data or not all(tag in gps_data for tag in _GPS_REQUIRED_TAGS):
+            return result
+        
+        try:
+            lat_rational = gps_data[_TAG_LAT]
+            lon_rational = gps_data[_TAG_LON]
+            # References are single ASCII bytes; compare without decoding
+            south = gps_data[_TAG_LAT_REF][:1] == b'S'
+            west = gps_data[_TAG_LON_REF][:1] == b'W'
             
-            # Check if we have all required GPS fields
-            has_lat = piexif.GPSIFD.GPSLatitude in gps_data and piexif.GPSIFD.GPSLatitudeRef in gps_data
-            has_lon = piexif.GPSIFD.GPSLongitude in gps_data and piexif.GPSIFD.GPSLongitudeRef in gps_data
+            if convert_gps:
+                lat_decimal = rational_to_decimal(lat_rational)
+                lon_decimal = rational_to_decimal(lon_rational)
+                _set_location(result, -lat_decimal if south else lat_decimal,
+                              -lon_decimal if west else lon_decimal)
+            else:
+                # Converted together with the rest of the batch by _add_gps_coordinates
+                result['_gps_rationals'] = (lat_rational, lon_rational, south, west)
             
-            if has_lat and has_lon:
+            # Extract GPS altitude if available
+            if _TAG_ALT in gps_data:
                 try:
-                    # Get latitude
-                    lat_rational = gps_data[piexif.GPSIFD.GPSLatitude]
-                    lat_ref_bytes = gps_data[piexif.GPSIFD.GPSLatitudeRef]
-                    
-                    # Decode latitude reference with error handling
-                    try:
-                        lat_ref = lat_ref_bytes.decode('utf-8')
-                    except (AttributeError, UnicodeDecodeError):
-                        lat_ref = lat_ref_bytes.decode('latin-1', errors='replace')
-                    
-                    lat_decimal = rational_to_decimal(lat_rational)
-                    if lat_ref == 'S':
-                        lat_decimal *= -1
-                    
-                    # Get longitude
-                    lon_rational = gps_data[piexif.GPSIFD.GPSLongitude]
-                    lon_ref_bytes = gps_data[piexif.GPSIFD.GPSLongitudeRef]
-                    
-                    # Decode longitude reference with error handling
-                    try:
-                        lon_ref = lon_ref_bytes.decode('utf-8')
-                    except (AttributeError, UnicodeDecodeError):
-                        lon_ref = lon_ref_bytes.decode('latin-1', errors='replace')
+                    altitude_rational = gps_data[_TAG_ALT]
+                    altitude_ref = gps_data.get(_TAG_ALT_REF, 0)
                     
-                    lon_decimal = rational_to_decimal(lon_rational)
-                    if lon_ref == 'W':
-                        lon_decimal *= -1
+                    # Convert rational to float
+                    if isinstance(altitude_rational, tuple) and len(altitude_rational) == 2:
+                        altitude = altitude_rational[0] / altitude_rational[1]
+                    else:
+                        altitude = float(altitude_rational)
                     
-                    # Convert to human-readable format
-                    lat_str = decimal_to_dms(lat_decimal, is_latitude=True)
-                    lon_str = decimal_to_dms(lon_decimal, is_latitude=False)
-                    result['location'] = f"{lat_str}, {lon_str}"
+                    # Apply altitude reference (0 = above sea level, 1 = below sea level)
+                    if altitude_ref == 1:
+                        altitude *= -1
                     
-                    # Extract GPS altitude if available
-                    if piexif.GPSIFD.GPSAltitude in gps_data:
-                        try:
-                            altitude_rational = gps_data[piexif.GPSIFD.GPSAltitude]
-                            altitude_ref = gps_data.get(piexif.GPSIFD.GPSAltitudeRef, 0)
-                            
-                            # Convert rational to float
-                            if isinstance(altitude_rational, tuple) and len(altitude_rational) == 2:
-                                altitude = altitude_rational[0] / altitude_rational[1]
-                            else:
-                                altitude = float(altitude_rational)
-                            
-                            # Apply altitude reference (0 = above sea level, 1 = below sea level)
-                            if altitude_ref == 1:
-                                altitude *= -1
-                            
-                            result['altitude'] = altitude
-                        except (ValueError, ZeroDivisionError, TypeError) as e:
-                            logging.debug(f"Could not parse altitude from {image_path}: {e}")
-                    
-                    # Extract GPS image direction if available
-                    if piexif.GPSIFD.GPSImgDirection in gps_data:
-                        try:
-                            direction_rational = gps_data[piexif.GPSIFD.GPSImgDirection]
-                            direction_ref = gps_data.get(piexif.GPSIFD.GPSImgDirectionRef, b'T')
-                            
-                            # Convert rational to float
-                            if isinstance(direction_rational, tuple) and len(direction_rational) == 2:
-                                direction = direction_rational[0] / direction_rational[1]
-                            else:
-                                direction = float(direction_rational)
-                            
-                            # Direction ref can be 'T' (True North) or 'M' (Magnetic North)
-                            # We'll use the value as-is since most devices use True North
-                            result['direction'] = direction
-                            logging.debug(f"Extracted direction: {direction}° from {image_path}")
-                        except (ValueError, ZeroDivisionError, TypeError) as e:
-                            logging.debug(f"Could not parse direction from {image_path}: {e}")
+                    result['altitude'] = altitude
+                except (ValueError, ZeroDivisionError, TypeError) as e:
+                    logging.debug(f"Could not parse altitude from {image_path}: {e}")
+            
+            # Extract GPS image direction if available
+            if _TAG_IMG_DIR in gps_data:
+                try:
+                    direction_rational = gps_data[_TAG_IMG_DIR]
+                    direction_ref = gps_data.get(_TAG_IMG_DIR_REF, b'T')
                     
-                    # Transform to UTM if enabled
-                    if config.SHOW_UTM_COORDINATES:
-                        try:
-                            easting, northing = transform_to_utm(
-                                lat_decimal, lon_decimal, config.TARGET_EPSG
-                            )
-                            result['location_utm'] = format_utm_coordinates(
-                                easting, northing, config.UTM_ZONE, config.UTM_HEMISPHERE
-                            )
-                        except Exception as e:
-                            logging.warning(f"Failed to transform coordinates for {image_path}: {e}")
-                            result['location_utm'] = None
+                    # Convert rational to float
+                    if isinstance(direction_rational, tuple) and len(direction_rational) == 2:
+                        direction = direction_rational[0] / direction_rational[1]
+                    else:
+                        direction = float(direction_rational)
                     
-                except ValueError as e:
-                    logging.warning(f"Invalid GPS data in {image_path}: {e}")
-                except (KeyError, IndexError, ZeroDivisionError) as e:
-                    logging.warning(f"Error parsing GPS coordinates from {image_path}: {e}")
+                    # Direction ref can be 'T' (True North) or 'M' (Magnetic North)
+                    # We'll use the value as-is since most devices use True North
+                    result['direction'] = direction
+                    logging.debug(f"Extracted direction: {direction}° from {image_path}")
+                except (ValueError, ZeroDivisionError, TypeError) as e:
+                    logging.debug(f"Could not parse direction from {image_path}: {e}")
+            
+            # Transform to UTM if enabled
+            cfg = config.CONFIG
+            if convert_gps and transform_utm and cfg.show_utm_coordinates:
+                try:
+                    easting, northing = transform_to_utm(
+                        result['latitude'], result['longitude'], cfg.target_epsg
+                    )
+                    result['location_utm'] = format_utm_coordinates(
+                        easting, northing, cfg.utm_zone, cfg.utm_hemisphere
+                    )
+                except Exception as e:
+                    logging.warning(f"Failed to transform coordinates for {image_path}: {e}")
+                    result['location_utm'] = None
+            
+        except ValueError as e:
+            logging.warning(f"Invalid GPS data in {image_path}: {e}")
+        except (KeyError, IndexError, ZeroDivisionError) as e:
+            logging.warning(f"Error parsing GPS coordinates from {image_path}: {e}")
     
-    except piexif.InvalidImageDataError as e:
-        # Specific exception for invalid/corrupted EXIF data
+    except ValueError as e:
+        # Raised by _load_exif_tags for invalid/corrupted EXIF data
         logging.warning(f"Invalid or corrupted EXIF data in {image_path}: {e}")
     except FileNotFoundError as e:
         logging.error(f"Image file not found: {image_path}")
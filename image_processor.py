@@ -4,12 +4,26 @@ Image Processing Module
 Handles image reading, text overlay creation, and saving processed images.
 """
 
+import io
+import math
+import sys
 from PIL import Image, ImageDraw, ImageFont, UnidentifiedImageError
 from pathlib import Path
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Tuple
 import logging
-import piexif
+import logging.handlers
 import config
-from exif_handler import extract_exif_data
+from exif_handler import extract_exif_data_batch, parse_exif_bytes
+
+
+# Encoded images allowed to wait for the background writer (see process_images)
+_MAX_PENDING_WRITES = 2
+
+# Jobs per worker task in process_batch
+_CHUNK_SIZE = 8
 
 
 def create_overlay_text(metadata: dict) -> str:
@@ -23,79 +37,109 @@ def create_overlay_text(metadata: dict) -> str:
     Returns:
         Formatted text string for overlay
     """
-    lines = []
+    # Look each key up once
+    project_info = metadata.get('project_info')
+    filename = metadata.get('filename')
+    datetime_value = metadata.get('datetime')
+    location = metadata.get('location')
+    location_utm = metadata.get('location_utm')
+    altitude = metadata.get('altitude')
+    direction = metadata.get('direction')
     
-    # Add project info at the top (if available)
-    if metadata.get('project_info'):
-        lines.append(metadata['project_info'])
-        lines.append('')  # Add blank line separator
+    lines = []
     
     # Add filename (if available)
-    if metadata.get('filename'):
-        lines.append(metadata['filename'])
+    if filename:
+        lines.append(filename)
     
-    if metadata.get('datetime'):
+    if datetime_value:
         # Format datetime (from "YYYY:MM:DD HH:MM:SS" to more readable format)
-        datetime_str = metadata['datetime'].replace(':', '-', 2)
+        datetime_str = datetime_value.replace(':', '-', 2)
         lines.append(f"Date: {datetime_str}")
     
-    if metadata.get('location'):
-        lines.append(f"Location: {metadata['location']}")
+    if location:
+        lines.append(f"Location: {location}")
     
     # Add UTM coordinates if available
-    if metadata.get('location_utm'):
-        lines.append(metadata['location_utm'])
+    if location_utm:
+        lines.append(location_utm)
     
     # Add altitude/height if available
-    if metadata.get('altitude') is not None:
-        lines.append(f"Height: {metadata['altitude']:.1f} m")
+    if altitude is not None:
+        lines.append(f"Height: {altitude:.1f} m")
     
     # Add direction if available or show N/A
     if metadata.get('show_direction'):
-        if metadata.get('direction') is not None and metadata.get('direction_cardinal'):
-            lines.append(f"Direction: {metadata['direction']:.0f}° ({metadata['direction_cardinal']})")
+        direction_cardinal = metadata.get('direction_cardinal')
+        if direction is not None and direction_cardinal:
+            lines.append(f"Direction: {direction:.0f}° ({direction_cardinal})")
         else:
             lines.append("Direction: N/A")
     
     # If only filename/project exists, add "No metadata available"
-    metadata_exists = any([
-        metadata.get('datetime'),
-        metadata.get('location'),
-        metadata.get('altitude') is not None,
-        metadata.get('direction') is not None
-    ])
-    if not metadata_exists and (metadata.get('filename') or metadata.get('project_info')):
+    metadata_exists = (datetime_value or location or altitude is not None
+                       or direction is not None)
+    if not metadata_exists and (filename or project_info):
         lines.append("No metadata available")
     
+    # Add project info at the top, separated by a blank line (if available)
+    if project_info:
+        return (f"{project_info}\n\n" + '\n'.join(lines)) if lines else f"{project_info}\n"
+    
     return '\n'.join(lines) if lines else "No metadata available"
 
 
+# System fonts tried when the configured font cannot be loaded, chosen for
+# the current platform once at import (other platforms' paths never exist)
+if sys.platform.startswith('win'):
+    _FALLBACK_FONTS = (
+        "C:/Windows/Fonts/arial.ttf",
+        "C:/Windows/Fonts/verdana.ttf",
+    )
+elif sys.platform == 'darwin':
+    _FALLBACK_FONTS = ("/System/Library/Fonts/Helvetica.ttc",)
+else:
+    _FALLBACK_FONTS = ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",)  # Linux
+
+
 def load_font_with_fallback() -> ImageFont.FreeTypeFont:
     """
-    Load font with fallback to bundled default font.
+    Load the configured font with fallback to system/default fonts.
+    
+    The font is loaded once per (path, size) and process and then reused,
+    including the result of the fallback search.
+    
+    Returns:
+        Loaded font object
+    """
+    cfg = config.CONFIG
+    return _load_font(cfg.font_path, cfg.font_size)
+
+
+@lru_cache(maxsize=8)
+def _load_font(font_path: str, font_size: int) -> ImageFont.FreeTypeFont:
+    """
+    Load a font, trying the fallback fonts if font_path cannot be loaded.
     
+    Args:
+        font_path: Path to TrueType font file
+        font_size: Font size in points
+        
     Returns:
         Loaded font object
     """
     try:
-        font = ImageFont.truetype(config.FONT_PATH, config.FONT_SIZE)
-        logging.debug(f"Loaded font: {config.FONT_PATH} at size {config.FONT_SIZE}")
+        font = ImageFont.truetype(font_path, font_size)
+        logging.debug(f"Loaded font: {font_path} at size {font_size}")
         return font
     except (OSError, IOError) as e:
-        logging.warning(f"Could not load font from {config.FONT_PATH}: {e}")
+        logging.warning(f"Could not load font from {font_path}: {e}")
         logging.warning("Attempting to use default font")
         try:
             # Try to load a system font as fallback
-            # For Windows, try Arial
-            fallback_fonts = [
-                "C:/Windows/Fonts/arial.ttf",
-                "C:/Windows/Fonts/verdana.ttf",
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
-                "/System/Library/Fonts/Helvetica.ttc",  # macOS
-            ]
-            for fallback in fallback_fonts:
+            for fallback in _FALLBACK_FONTS:
                 try:
-                    font = ImageFont.truetype(fallback, config.FONT_SIZE)
+                    font = ImageFont.truetype(fallback, font_size)
                     logging.info(f"Using fallback font: {fallback}")
                     return font
                 except (OSError, IOError):
@@ -109,6 +153,68 @@ def load_font_with_fallback() -> ImageFont.FreeTypeFont:
             return ImageFont.load_default()
 
 
+# Text anchor per TEXT_POSITION: horizontal l(eft)/r(ight), vertical
+# a(scender of the first line)/d(escender of the last line). Multiline
+# text only supports the a/d vertical anchors.
+_POSITION_ANCHORS = {
+    'top-left': 'la',
+    'top-right': 'ra',
+    'bottom-left': 'ld',
+    'bottom-right': 'rd'
+}
+
+
+# Scratch drawing context used only to measure text
+_MEASURE_DRAW = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+
+
+def _render_overlay(text: str, anchor: str, font_path: str, font_size: int,
+                    fill: Tuple[int, int, int], stroke_width: int,
+                    stroke_fill: Tuple[int, int, int]) -> Optional[Tuple[Image.Image, Tuple[int, int]]]:
+    """
+    Render overlay text into a transparent sub-image.
+    
+    The sub-image only covers the text's bounding box (including the
+    outline), so its size depends on the text rather than on the frame.
+    It is not cached: the overlay always starts with the image's filename,
+    so no two images share the same text.
+    
+    Args:
+        text: Overlay text (may contain newlines)
+        anchor: Pillow text anchor (see _POSITION_ANCHORS)
+        font_path: Path of the configured font (see _load_font)
+        font_size: Font size in points
+        fill: Text color as RGB tuple
+        stroke_width: Outline width in pixels
+        stroke_fill: Outline color as RGB tuple
+        
+    Returns:
+        Tuple of (RGBA sub-image, offset of its top-left corner from the
+        anchor point), or None if the text has no extent
+    """
+    font = _load_font(font_path, font_size)
+    left, top, right, bottom = _MEASURE_DRAW.multiline_textbbox(
+        (0, 0), text, font=font, anchor=anchor, stroke_width=stroke_width
+    )
+    # Right/bottom anchors can give fractional boxes: round outwards
+    left, top = math.floor(left), math.floor(top)
+    right, bottom = math.ceil(right), math.ceil(bottom)
+    if right <= left or bottom <= top:
+        return None
+    
+    overlay = Image.new('RGBA', (right - left, bottom - top), (0, 0, 0, 0))
+    ImageDraw.Draw(overlay).multiline_text(
+        (-left, -top),
+        text,
+        font=font,
+        anchor=anchor,
+        fill=fill,
+        stroke_width=stroke_width,
+        stroke_fill=stroke_fill
+    )
+    return overlay, (left, top)
+
+
 def process_image(input_path: str, output_path: str) -> bool:
     """
     Process a single image by adding metadata overlay.
@@ -120,105 +226,292 @@ def process_image(input_path: str, output_path: str) -> bool:
     Returns:
         True if successful, False otherwise
     """
+    return process_images([(input_path, output_path)])[0]
+
+
+def process_images(jobs: List[Tuple[str, str]]) -> List[bool]:
+    """
+    Process several images one after another in the current process.
+    
+    All images are opened first (headers only), so the EXIF metadata of the
+    whole batch is extracted in one call, with a single vectorized GPS and
+    UTM conversion (see extract_exif_data_batch). The opened files stay open
+    until their image is processed, so pass batches of a few dozen images
+    at most, as process_batch and the command line do.
+    
+    Each encoded output is written to disk by a background thread while the
+    next image is decoded, so storage latency overlaps with CPU work. At most
+    _MAX_PENDING_WRITES encoded images wait for the writer, which bounds the
+    extra memory.
+    
+    Args:
+        jobs: List of (input_path, output_path) pairs
+        
+    Returns:
+        List of success flags, in the same order as jobs
+    """
+    results = [False] * len(jobs)
+    pending = deque()
+    opened = [_open_image(input_path) for input_path, _ in jobs]
+    
+    try:
+        indices = [index for index, item in enumerate(opened) if item is not None]
+        batch_metadata = extract_exif_data_batch(
+            [jobs[index][0] for index in indices],
+            [Path(jobs[index][0]).stem for index in indices],
+            exif_dicts=[opened[index][2] for index in indices]
+        )
+        metadata = dict(zip(indices, batch_metadata))
+        
+        with ThreadPoolExecutor(max_workers=1) as writer:
+            for index in indices:
+                input_path, output_path = jobs[index]
+                image, exif_bytes, _ = opened[index]
+                try:
+                    buffer = _encode_image(image, exif_bytes, metadata[index],
+                                           input_path, output_path)
+                finally:
+                    # Release the decoded pixels before the next image
+                    image.close()
+                    opened[index] = None
+                if buffer is None:
+                    continue
+                
+                pending.append((index, writer.submit(_write_output, buffer, output_path)))
+                if len(pending) > _MAX_PENDING_WRITES:
+                    done_index, future = pending.popleft()
+                    results[done_index] = future.result()
+            
+            for index, future in pending:
+                results[index] = future.result()
+    finally:
+        for item in opened:
+            if item is not None:
+                item[0].close()
+    
+    return results
+
+
+def _open_image(input_path: str) -> Optional[Tuple[Image.Image, Optional[bytes], Optional[dict]]]:
+    """
+    Open an image without decoding its pixels and parse its EXIF data.
+    
+    Args:
+        input_path: Path to source JPG image
+        
+    Returns:
+        Tuple of (opened image, raw EXIF bytes or None, EXIF dictionary or
+        None if it is corrupted), or None if the file cannot be opened
+    """
+    # verify() (which needs a second open) is skipped unless VERIFY_IMAGES is
+    # set: load() in _encode_image already raises for truncated or corrupt data
+    try:
+        if config.CONFIG.verify_images:
+            # Optional full integrity check; verify() invalidates the image
+            with Image.open(input_path) as check_image:
+                check_image.verify()
+        image = Image.open(input_path)
+        # Ask the JPEG decoder for RGB at full size before decoding
+        image.draft('RGB', image.size)
+    except UnidentifiedImageError as e:
+        logging.error(f"Cannot identify image file {input_path}: {e}")
+        return None
+    except (OSError, IOError) as e:
+        logging.error(f"Cannot open image file {input_path}: {e}")
+        return None
+    except Exception as e:
+        logging.error(f"Unexpected error processing {input_path}: {e}", exc_info=True)
+        return None
+    
+    # Reuse the EXIF segment Pillow read while opening: it is preserved
+    # verbatim in the output and parsed for the overlay without reading the
+    # file again
+    exif_bytes = image.info.get('exif')
+    try:
+        exif_dict = parse_exif_bytes(exif_bytes)
+    except ValueError:
+        # Let extract_exif_data re-read and report the corrupted EXIF
+        exif_dict = None
+    
+    return image, exif_bytes, exif_dict
+
+
+def _encode_image(image: Image.Image, exif_bytes: Optional[bytes], metadata: dict,
+                  input_path: str, output_path: str) -> Optional[io.BytesIO]:
+    """
+    Decode an opened image, draw its metadata overlay and encode the result as JPEG.
+    
+    Args:
+        image: Image opened by _open_image (not yet decoded)
+        exif_bytes: Raw EXIF data to copy into the output (may be None)
+        metadata: EXIF metadata of the image, see extract_exif_data
+        input_path: Path to source JPG image (for log messages)
+        output_path: Path the result will be saved to (for log messages)
+        
+    Returns:
+        Buffer holding the encoded JPEG, or None if processing failed
+    """
+    cfg = config.CONFIG
     try:
-        # Extract filename without extension
-        filename_base = Path(input_path).stem
+        try:
+            image.load()
+        except (OSError, IOError) as e:
+            logging.error(f"Cannot open image file {input_path}: {e}")
+            return None
         
-        # Extract EXIF metadata
-        metadata = extract_exif_data(input_path, filename=filename_base)
+        # Grayscale/CMYK sources are converted once so the RGB text colors apply
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
         
         # Add project info if configured
-        if config.PROJECT_INFO:
-            metadata['project_info'] = config.PROJECT_INFO
+        if cfg.project_info:
+            metadata['project_info'] = cfg.project_info
         
         # Add direction display flag
-        metadata['show_direction'] = config.SHOW_DIRECTION
+        metadata['show_direction'] = cfg.show_direction
         
         # Convert direction to cardinal if available and enabled
-        if config.SHOW_DIRECTION and metadata.get('direction') is not None:
+        if cfg.show_direction and metadata.get('direction') is not None:
             from exif_handler import degrees_to_cardinal
             metadata['direction_cardinal'] = degrees_to_cardinal(
                 metadata['direction'], 
-                config.DIRECTION_PRECISION
+                cfg.direction_precision
             )
         
-        # Open and verify image
-        try:
-            image = Image.open(input_path)
-            image.verify()  # Verify image integrity
-            image = Image.open(input_path)  # Reload after verify
-        except UnidentifiedImageError as e:
-            logging.error(f"Cannot identify image file {input_path}: {e}")
-            return False
-        except (OSError, IOError) as e:
-            logging.error(f"Cannot open image file {input_path}: {e}")
-            return False
-        
-        # Preserve original EXIF data
-        try:
-            original_exif = piexif.load(input_path)
-            exif_bytes = piexif.dump(original_exif)
-        except Exception as e:
-            logging.warning(f"Could not load EXIF for preservation: {e}")
-            exif_bytes = None
-        
-        # Create a drawing context
-        draw = ImageDraw.Draw(image)
-        
-        # Load font (singleton pattern - could be optimized further)
-        font = load_font_with_fallback()
-        
         # Prepare overlay text
         overlay_text = create_overlay_text(metadata)
         
-        # Calculate text bounding box
-        bbox = draw.textbbox((0, 0), overlay_text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        
-        # Calculate text position based on configuration
-        position_map = {
-            'top-left': (config.PADDING, config.PADDING),
-            'top-right': (image.width - text_width - config.PADDING, config.PADDING),
-            'bottom-left': (config.PADDING, image.height - text_height - config.PADDING),
-            'bottom-right': (image.width - text_width - config.PADDING, 
-                           image.height - text_height - config.PADDING)
-        }
+        # Anchor the text at the padded corner so it needs no measuring
+        anchor = _POSITION_ANCHORS.get(cfg.text_position, 'ld')
+        x = cfg.padding if anchor[0] == 'l' else image.width - cfg.padding
+        y = cfg.padding if anchor[1] == 'a' else image.height - cfg.padding
         
-        position = position_map.get(config.TEXT_POSITION, 
-                                    (config.PADDING, image.height - text_height - config.PADDING))
-        
-        # Draw text with outline using modern Pillow API
-        # This replaces the old nested loop approach with native stroke support
-        draw.text(
-            position, 
-            overlay_text, 
-            font=font, 
-            fill=config.TEXT_COLOR,
-            stroke_width=config.OUTLINE_WIDTH,
-            stroke_fill=config.OUTLINE_COLOR
+        # Render the text with its outline (native stroke support), then
+        # paste it using its own alpha (paste clips whatever falls outside
+        # the frame)
+        rendered = _render_overlay(
+            overlay_text,
+            anchor,
+            cfg.font_path,
+            cfg.font_size,
+            cfg.text_color,
+            cfg.outline_width,
+            cfg.outline_color
         )
+        if rendered is not None:
+            overlay, (offset_x, offset_y) = rendered
+            image.paste(overlay, (x + offset_x, y + offset_y), overlay)
         
-        # Save processed image with original EXIF preserved
+        # Save processed image with original EXIF preserved.
+        # By default a single-pass baseline encode: OPTIMIZE_JPEG adds a second
+        # Huffman pass for a small size saving; 4:2:0 chroma subsampling
+        # halves the chroma samples to encode.
         save_kwargs = {
-            'quality': config.OUTPUT_QUALITY,
-            'optimize': True
+            'quality': cfg.output_quality,
+            'subsampling': 2,
+            'optimize': cfg.optimize_jpeg,
+            'progressive': cfg.progressive_jpeg
         }
         
+        # Reuse the source's quantization tables and chroma subsampling: no
+        # requantization of the untouched areas. Only possible while the image
+        # is still the decoded JPEG (not after a mode conversion).
+        if cfg.quality_keep and image.format == 'JPEG':
+            save_kwargs['quality'] = 'keep'
+            save_kwargs['subsampling'] = 'keep'
+        
         if exif_bytes:
             save_kwargs['exif'] = exif_bytes
         
+        # Encode in memory; the file is then written in one go (see
+        # _write_output), avoiding many small writes and metadata
+        # round-trips on network filesystems
         try:
-            image.save(output_path, **save_kwargs)
-            logging.debug(f"Saved processed image to: {output_path}")
+            buffer = io.BytesIO()
+            image.save(buffer, 'JPEG', **save_kwargs)
         except (OSError, IOError) as e:
             logging.error(f"Failed to save image to {output_path}: {e}")
-            return False
+            return None
         
-        return True
+        return buffer
         
     except Exception as e:
         # Catch any unexpected exceptions
         logging.error(f"Unexpected error processing {input_path}: {e}", exc_info=True)
+        return None
+
+
+def _write_output(buffer: io.BytesIO, output_path: str) -> bool:
+    """
+    Write an encoded image to output_path with a single write call.
+    
+    Args:
+        buffer: Encoded JPEG from _encode_image
+        output_path: Path to save processed image
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        with open(output_path, 'wb') as output_file:
+            output_file.write(buffer.getbuffer())
+        logging.debug(f"Saved processed image to: {output_path}")
+        return True
+    except (OSError, IOError) as e:
+        logging.error(f"Failed to save image to {output_path}: {e}")
         return False
 
+
+def init_worker(config_snapshot: config.Config, log_queue=None,
+                log_level: int = logging.DEBUG) -> None:
+    """
+    Process pool initializer: adopt the parent's settings and warm caches.
+    
+    Loading the font here (see _load_font) moves its cost out of the first
+    image each worker processes. Spawned workers do not inherit the parent's
+    logging setup; with log_queue their records are sent to the parent
+    instead (see logging.handlers.QueueListener).
+    
+    Args:
+        config_snapshot: Config built by config.load_config() in the parent process
+        log_queue: Queue to forward log records to (optional, keeps the
+                   inherited logging setup when omitted)
+        log_level: Lowest level forwarded through log_queue
+    """
+    if log_queue is not None:
+        root = logging.getLogger()
+        root.handlers.clear()
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        root.setLevel(log_level)
+    
+    config.use_config(config_snapshot)
+    load_font_with_fallback()
+
+
+def process_batch(jobs: List[Tuple[str, str]], max_workers: Optional[int] = None) -> List[bool]:
+    """
+    Process many images in parallel worker processes.
+    
+    Jobs are handed to the workers in chunks of _CHUNK_SIZE, each processed
+    with process_images. Each worker builds its own coordinate transformer
+    and font on first use and reuses them for the rest of its share of the
+    batch. Batches of fewer than 4 images are processed serially, since
+    starting the pool would cost more than it saves.
+    
+    Args:
+        jobs: List of (input_path, output_path) pairs
+        max_workers: Number of worker processes (default: config.CONFIG.max_workers)
+        
+    Returns:
+        List of success flags, in the same order as jobs
+    """
+    if len(jobs) < 4:
+        return process_images(jobs)
+    
+    if max_workers is None:
+        max_workers = config.CONFIG.max_workers
+    
+    chunks = [jobs[start:start + _CHUNK_SIZE] for start in range(0, len(jobs), _CHUNK_SIZE)]
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                             initargs=(config.CONFIG,)) as executor:
+        return [success for chunk in executor.map(process_images, chunks) for success in chunk]
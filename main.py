@@ -8,13 +8,25 @@ with metadata overlays in the output/ folder.
 import os
 import argparse
 import logging
+import logging.handlers
 import sys
+import multiprocessing
 from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from typing import List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
 from tqdm import tqdm
 import config
-from image_processor import process_image
+from image_processor import init_worker, process_images
+
+
+# Input file extensions (compared lowercase)
+JPEG_EXTENSIONS = frozenset({'.jpg', '.jpeg'})
+
+# Start-of-image marker every JPEG file begins with
+JPEG_SIGNATURE = b'\xff\xd8\xff'
+
+# Largest number of images handed to a worker at once
+MAX_CHUNK_SIZE = 16
 
 
 # Configure logging
@@ -95,7 +107,7 @@ Examples:
     # Configuration overrides
     parser.add_argument(
         '--position', '-p',
-        choices=['top-left', 'top-right', 'bottom-left', 'bottom-right'],
+        choices=config.VALID_POSITIONS,
         help=f'Text position on image (default: {config.TEXT_POSITION})'
     )
     parser.add_argument(
@@ -115,6 +127,33 @@ Examples:
         type=int,
         help=f'Output JPEG quality 1-100 (default: {config.OUTPUT_QUALITY})'
     )
+    parser.add_argument(
+        '--quality-keep',
+        action='store_true',
+        help='Keep each source JPEG\'s quantization tables and subsampling '
+             '(overrides --quality; avoids requantizing untouched areas)'
+    )
+    parser.add_argument(
+        '--optimize',
+        action='store_true',
+        help='Optimize JPEG Huffman tables: a few percent smaller files, '
+             'but an extra encoding pass makes saving much slower'
+    )
+    parser.add_argument(
+        '--no-optimize',
+        action='store_true',
+        help='Disable JPEG Huffman table optimization (faster saves)'
+    )
+    parser.add_argument(
+        '--progressive',
+        action='store_true',
+        help='Write progressive JPEGs (load incrementally in browsers, slower to encode)'
+    )
+    parser.add_argument(
+        '--no-progressive',
+        action='store_true',
+        help='Write baseline JPEGs'
+    )
     
     # Coordinate system options
     parser.add_argument(
@@ -163,7 +202,7 @@ Examples:
     )
     parser.add_argument(
         '--collision',
-        choices=['overwrite', 'skip', 'rename'],
+        choices=config.VALID_COLLISION_MODES,
         default=config.FILE_COLLISION_MODE,
         help=f'File collision handling mode (default: {config.FILE_COLLISION_MODE})'
     )
@@ -195,7 +234,8 @@ Examples:
 
 def apply_argument_overrides(args):
     """
-    Apply command-line argument overrides to config module.
+    Apply command-line argument overrides to config module
+    and refresh the config.CONFIG snapshot.
     
     Args:
         args: Parsed command-line arguments
@@ -208,6 +248,16 @@ def apply_argument_overrides(args):
         config.FONT_SIZE = args.font_size
     if args.quality:
         config.OUTPUT_QUALITY = args.quality
+    if args.quality_keep:
+        config.QUALITY_KEEP = True
+    if args.optimize:
+        config.OPTIMIZE_JPEG = True
+    if args.no_optimize:
+        config.OPTIMIZE_JPEG = False
+    if args.progressive:
+        config.PROGRESSIVE_JPEG = True
+    if args.no_progressive:
+        config.PROGRESSIVE_JPEG = False
     if args.target_epsg:
         config.TARGET_EPSG = args.target_epsg
     if args.no_utm:
@@ -227,6 +277,8 @@ def apply_argument_overrides(args):
     
     # Update file collision mode
     config.FILE_COLLISION_MODE = args.collision
+    
+    config.load_config()
 
 
 def get_unique_output_path(output_path: Path) -> Path:
@@ -254,41 +306,99 @@ def get_unique_output_path(output_path: Path) -> Path:
         counter += 1
 
 
-def process_single_image(args_tuple: Tuple[Path, Path, str, dict]) -> Tuple[bool, str, str]:
+def has_jpeg_signature(path: Path) -> bool:
     """
-    Wrapper function for processing a single image (for multiprocessing).
+    Check whether a file starts with the JPEG start-of-image marker.
+    Only the first 3 bytes are read.
     
     Args:
-        args_tuple: Tuple of (input_path, output_dir, collision_mode, config_dict)
+        path: Path to the file
         
     Returns:
-        Tuple of (success, input_filename, message)
+        True if the file looks like a JPEG, False otherwise (including unreadable files)
     """
-    input_path, output_dir, collision_mode, config_dict = args_tuple
-    
-    # Apply config overrides in worker process
-    import config
-    for key, value in config_dict.items():
-        setattr(config, key, value)
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(JPEG_SIGNATURE)) == JPEG_SIGNATURE
+    except OSError:
+        return False
+
+
+def resolve_output_path(input_path: Path, output_dir: Path, collision_mode: str) -> Optional[Path]:
+    """
+    Determine where an input image is saved, applying the collision mode.
     
+    Args:
+        input_path: Path to the source image
+        output_dir: Output directory
+        collision_mode: 'overwrite', 'skip' or 'rename'
+        
+    Returns:
+        Output path, or None if the image should be skipped
+    """
     # Create output path with same filename
     output_path = output_dir / input_path.name
     
     # Handle file collision
     if output_path.exists():
         if collision_mode == 'skip':
-            return True, input_path.name, "skipped (already exists)"
+            return None
         elif collision_mode == 'rename':
             output_path = get_unique_output_path(output_path)
             logging.debug(f"Renamed output to: {output_path.name}")
     
-    # Process the image
-    success = process_image(str(input_path), str(output_path))
+    return output_path
+
+
+def process_image_chunk(args_tuple: Tuple[List[str], str, str]) -> List[Tuple[bool, str, str]]:
+    """
+    Wrapper function for processing a chunk of images (for multiprocessing).
+    
+    The images of a chunk are processed with process_images, which writes
+    each output in the background while the next image is decoded. Worker
+    processes receive the settings once, via init_worker.
+    
+    Args:
+        args_tuple: Tuple of (input_paths, output_dir, collision_mode), with
+                    paths as plain strings (cheaper to pickle than Path objects)
+        
+    Returns:
+        List of (success, input_filename, message) tuples, in input order
+    """
+    input_paths, output_dir, collision_mode = args_tuple
+    output_dir = Path(output_dir)
     
-    if success:
-        return True, input_path.name, "processed successfully"
-    else:
-        return False, input_path.name, "processing failed"
+    results = []
+    jobs = []
+    for input_path in map(Path, input_paths):
+        try:
+            output_path = resolve_output_path(input_path, output_dir, collision_mode)
+        except Exception as e:
+            results.append((False, input_path.name, f"Unexpected error: {e}"))
+            continue
+        if output_path is None:
+            results.append((True, input_path.name, "skipped (already exists)"))
+            continue
+        # Placeholder, filled in once the job has been processed
+        results.append(None)
+        jobs.append((len(results) - 1, input_path, output_path))
+    
+    try:
+        successes = process_images([(str(input_path), str(output_path))
+                                    for _, input_path, output_path in jobs])
+    except Exception as e:
+        # Report instead of raising: an exception would end the executor.map loop
+        for index, input_path, _ in jobs:
+            results[index] = (False, input_path.name, f"Unexpected error: {e}")
+        return results
+    
+    for (index, input_path, _), success in zip(jobs, successes):
+        if success:
+            results[index] = (True, input_path.name, "processed successfully")
+        else:
+            results[index] = (False, input_path.name, "processing failed")
+    
+    return results
 
 
 def main():
@@ -301,6 +411,16 @@ def main():
     # Setup logging
     setup_logging(args.verbose, args.quiet, args.log_file)
     
+    # Apply the settings preset selected by environment variable (if any)
+    preset = os.environ.get(config.PRESET_ENV_VAR)
+    if preset:
+        try:
+            config.apply_preset(preset)
+            logging.info(f"Using settings preset: {preset}")
+        except ValueError as e:
+            logging.error(f"Configuration error: {e}")
+            sys.exit(1)
+    
     # Apply argument overrides to config
     apply_argument_overrides(args)
     
@@ -343,9 +463,22 @@ def main():
         logging.error(f"Failed to create output directory: {e}")
         sys.exit(1)
     
-    # Get all JPG files from input directory (case-insensitive)
-    jpg_files = [f for f in input_dir.iterdir() 
-                 if f.is_file() and f.suffix.lower() in ['.jpg', '.jpeg']]
+    # Get all JPG files from input directory (case-insensitive) in a single
+    # scandir pass; DirEntry.is_file() needs no extra stat on most platforms
+    with os.scandir(input_dir) as entries:
+        candidates = sorted(Path(entry.path) for entry in entries
+                            if os.path.splitext(entry.name)[1].lower() in JPEG_EXTENSIONS
+                            and entry.is_file())
+    
+    # Skip empty or non-JPEG files here instead of sending them to a worker
+    jpg_files = []
+    invalid_count = 0
+    for candidate in candidates:
+        if has_jpeg_signature(candidate):
+            jpg_files.append(candidate)
+        else:
+            invalid_count += 1
+            logging.warning(f"Skipping {candidate.name}: not a JPEG file")
     
     if not jpg_files:
         logging.warning(f"No JPG images found in '{input_dir}' directory.")
@@ -366,7 +499,9 @@ def main():
         logging.info(f"  Text position: {config.TEXT_POSITION}")
         logging.info(f"  Text color: RGB{config.TEXT_COLOR}")
         logging.info(f"  Font size: {config.FONT_SIZE}")
-        logging.info(f"  Output quality: {config.OUTPUT_QUALITY}")
+        logging.info(f"  Output quality: {'keep (source tables)' if config.QUALITY_KEEP else config.OUTPUT_QUALITY}")
+        logging.info(f"  Optimize JPEG: {config.OPTIMIZE_JPEG}")
+        logging.info(f"  Progressive JPEG: {config.PROGRESSIVE_JPEG}")
         logging.info(f"  Show UTM coordinates: {config.SHOW_UTM_COORDINATES}")
         if config.SHOW_UTM_COORDINATES:
             logging.info(f"  Target EPSG: {config.TARGET_EPSG}")
@@ -380,19 +515,13 @@ def main():
         logging.info(f"  Collision mode: {args.collision}")
         return
     
-    # Prepare arguments for multiprocessing
-    config_dict = {
-        'TEXT_POSITION': config.TEXT_POSITION,
-        'TEXT_COLOR': config.TEXT_COLOR,
-        'FONT_SIZE': config.FONT_SIZE,
-        'OUTPUT_QUALITY': config.OUTPUT_QUALITY,
-        'TARGET_EPSG': config.TARGET_EPSG,
-        'SHOW_UTM_COORDINATES': config.SHOW_UTM_COORDINATES,
-        'SHOW_DIRECTION': config.SHOW_DIRECTION,
-        'DIRECTION_PRECISION': config.DIRECTION_PRECISION,
-        'PROJECT_INFO': config.PROJECT_INFO,
-    }
-    process_args = [(jpg_file, output_dir, args.collision, config_dict) for jpg_file in jpg_files]
+    # Prepare arguments for multiprocessing: chunks of roughly four per worker
+    # amortize IPC per image; the cap keeps the progress bar responsive
+    chunk_size = min(MAX_CHUNK_SIZE, max(1, len(jpg_files) // (args.workers * 4)))
+    # Paths are sent as plain strings, which pickle smaller than Path objects
+    jpg_paths = [str(jpg_file) for jpg_file in jpg_files]
+    process_args = [(jpg_paths[start:start + chunk_size], str(output_dir), args.collision)
+                    for start in range(0, len(jpg_paths), chunk_size)]
     
     # Process images with multiprocessing
     success_count = 0
@@ -400,29 +529,52 @@ def main():
     
     logging.info(f"Processing with {min(args.workers, len(jpg_files))} worker(s)...")
     
-    with ProcessPoolExecutor(max_workers=args.workers) as executor:
-        # Submit all tasks
-        futures = {executor.submit(process_single_image, arg): arg[0].name 
-                   for arg in process_args}
-        
-        # Process results with progress bar
-        with tqdm(total=len(jpg_files), desc="Processing images", 
-                  disable=args.quiet or args.verbose, unit="image") as pbar:
-            for future in as_completed(futures):
-                filename = futures[future]
-                try:
-                    success, name, message = future.result()
-                    results.append((success, name, message))
-                    if success:
-                        success_count += 1
-                        logging.debug(f"{name}: {message}")
-                    else:
-                        logging.error(f"{name}: {message}")
-                except Exception as e:
-                    logging.error(f"{filename}: Unexpected error: {e}")
-                    results.append((False, filename, f"exception: {e}"))
-                finally:
-                    pbar.update(1)
+    # Spawned workers start clean (no inherited file descriptors or state,
+    # same behavior on every platform); init_worker hands them the settings
+    # (including CLI overrides) and loads the font once per worker
+    mp_context = multiprocessing.get_context('spawn')
+    
+    # Workers forward their log records to the handlers set up here, only
+    # down to the lowest level any of those handlers would output
+    root_logger = logging.getLogger()
+    log_level = min((handler.level for handler in root_logger.handlers), default=logging.WARNING)
+    log_queue = mp_context.Queue()
+    log_listener = logging.handlers.QueueListener(log_queue, *root_logger.handlers,
+                                                  respect_handler_level=True)
+    log_listener.start()
+    
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers,
+                                 mp_context=mp_context,
+                                 initializer=init_worker,
+                                 initargs=(config.CONFIG, log_queue, log_level)) as executor:
+            # Process results with progress bar (in input order)
+            # Redraw the progress bar at most twice a second and about 100 times in total
+            with tqdm(total=len(jpg_files), desc="Processing images", 
+                      disable=args.quiet or args.verbose, unit="image",
+                      miniters=max(1, len(jpg_files) // 100), mininterval=0.5,
+                      smoothing=0.3) as pbar:
+                futures = [executor.submit(process_image_chunk, chunk_args)
+                           for chunk_args in process_args]
+                for (chunk_paths, _, _), future in zip(process_args, futures):
+                    try:
+                        chunk_results = future.result()
+                    except Exception as e:
+                        # The chunk never completed (e.g. BrokenProcessPool after a
+                        # worker was killed): fail its images, keep the others
+                        chunk_results = [(False, Path(path).name, f"Unexpected error: {e}")
+                                         for path in chunk_paths]
+                    for success, name, message in chunk_results:
+                        results.append((success, name, message))
+                        if success:
+                            success_count += 1
+                            logging.debug(f"{name}: {message}")
+                        else:
+                            logging.error(f"{name}: {message}")
+                    pbar.update(len(chunk_results))
+    finally:
+        # All workers have exited: output their remaining log records
+        log_listener.stop()
     
     # Summary
     logging.info("=" * 60)
@@ -431,6 +583,8 @@ def main():
     if success_count < len(jpg_files):
         failed_count = len(jpg_files) - success_count
         logging.warning(f"Failed: {failed_count} image(s)")
+    if invalid_count:
+        logging.warning(f"Skipped: {invalid_count} file(s) without JPEG data")
     logging.info(f"Output saved to: {output_dir.absolute()}")
     logging.info("=" * 60)
 
@@ -0,0 +1,178 @@
+"""
+Tests for the EXIF reader in exif_handler.
+
+The reader replaced piexif, so its output for the tags we use is compared
+against piexif.load on the same data (skipped when piexif is not installed).
+"""
+
+import io
+import os
+import struct
+import tempfile
+import unittest
+
+from PIL import Image
+
+import exif_handler
+from exif_handler import _load_exif_tags, extract_exif_data, parse_exif_bytes
+
+try:
+    import piexif
+except ImportError:
+    piexif = None
+
+# Tags compared with piexif: everything _read_exif_data looks at
+_ZEROTH_TAGS = (0x0132, 0x8825)
+_GPS_TAGS = (0x0001, 0x0002, 0x0003, 0x0004, 0x0005, 0x0006, 0x0010, 0x0011)
+
+# GPS IFD in piexif.dump form: 52°31'12.5" N, 13°24'3" E, 34.5 m, 123.4°
+_GPS_IFD = {
+    0x0001: b'N',
+    0x0002: ((52, 1), (31, 1), (125, 10)),
+    0x0003: b'E',
+    0x0004: ((13, 1), (24, 1), (3, 1)),
+    0x0005: 0,
+    0x0006: (345, 10),
+    0x0010: b'T',
+    0x0011: (1234, 10),
+}
+
+
+def _jpeg_bytes(**save_kwargs) -> bytes:
+    """Encode a small JPEG with Pillow."""
+    buffer = io.BytesIO()
+    Image.new('RGB', (16, 16), (200, 100, 50)).save(buffer, 'JPEG', **save_kwargs)
+    return buffer.getvalue()
+
+
+def _app1(payload: bytes) -> bytes:
+    """Wrap payload in an APP1 segment."""
+    return b'\xff\xe1' + struct.pack('>H', len(payload) + 2) + payload
+
+
+def _piexif_tags(data) -> dict:
+    """The tags we use from piexif.load(data), shaped like parse_exif_bytes output."""
+    loaded = piexif.load(data)
+    result = {'0th': {tag: loaded['0th'][tag] for tag in _ZEROTH_TAGS if tag in loaded['0th']}}
+    if loaded['GPS']:
+        result['GPS'] = {tag: loaded['GPS'][tag] for tag in _GPS_TAGS if tag in loaded['GPS']}
+    return result
+
+
+def _our_tags(exif_dict: dict) -> dict:
+    """Restrict parse_exif_bytes output to the compared tags."""
+    result = {'0th': {tag: exif_dict['0th'][tag] for tag in _ZEROTH_TAGS if tag in exif_dict['0th']}}
+    if 'GPS' in exif_dict:
+        result['GPS'] = {tag: exif_dict['GPS'][tag] for tag in _GPS_TAGS if tag in exif_dict['GPS']}
+    return result
+
+
+@unittest.skipIf(piexif is None, "piexif is not installed")
+class ParseExifBytesTest(unittest.TestCase):
+    """parse_exif_bytes and _load_exif_tags agree with piexif.load."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        exif_handler._extract_cached.cache_clear()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, name: str, data: bytes) -> str:
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def _assert_matches_piexif(self, exif_bytes: bytes):
+        self.assertEqual(_our_tags(parse_exif_bytes(exif_bytes)), _piexif_tags(exif_bytes))
+
+    def test_big_endian(self):
+        exif_bytes = piexif.dump({'0th': {0x0132: b'2024:05:06 07:08:09'}, 'GPS': _GPS_IFD})
+        self.assertEqual(exif_bytes[6:8], b'MM')
+        self._assert_matches_piexif(exif_bytes)
+
+    def test_little_endian(self):
+        exif = Image.Exif()
+        exif.endian = '<'
+        exif[0x0132] = '2024:05:06 07:08:09'
+        gps = exif.get_ifd(0x8825)
+        gps[0x0001] = 'S'
+        gps[0x0002] = (52.0, 31.0, 12.5)
+        gps[0x0003] = 'W'
+        gps[0x0004] = (13.0, 24.0, 3.0)
+        gps[0x0006] = 34.5
+        exif_bytes = exif.tobytes()
+        self.assertEqual(exif_bytes[6:8], b'II')
+        self._assert_matches_piexif(exif_bytes)
+        self.assertEqual(parse_exif_bytes(exif_bytes)['GPS'][0x0001], b'S')
+
+    def test_thumbnail_is_ignored(self):
+        exif_bytes = piexif.dump({
+            '0th': {0x0132: b'2024:05:06 07:08:09'},
+            'GPS': _GPS_IFD,
+            '1st': {0x0103: 6},
+            'thumbnail': _jpeg_bytes(),
+        })
+        self._assert_matches_piexif(exif_bytes)
+
+    def test_no_gps(self):
+        exif_bytes = piexif.dump({'0th': {0x0132: b'2024:05:06 07:08:09'}})
+        self._assert_matches_piexif(exif_bytes)
+        self.assertNotIn('GPS', parse_exif_bytes(exif_bytes))
+
+    def test_xmp_segment_before_exif(self):
+        exif_bytes = piexif.dump({'0th': {0x0132: b'2024:05:06 07:08:09'}, 'GPS': _GPS_IFD})
+        xmp = _app1(b'http://ns.adobe.com/xap/1.0/\x00<x:xmpmeta/>')
+        jpeg = _jpeg_bytes()
+        path = self._write('xmp.jpg', jpeg[:2] + xmp + _app1(exif_bytes) + jpeg[2:])
+        self.assertEqual(_our_tags(_load_exif_tags(path)), _piexif_tags(path))
+
+    def test_zero_denominator(self):
+        gps = dict(_GPS_IFD)
+        gps[0x0002] = ((52, 0), (31, 1), (125, 10))
+        exif_bytes = piexif.dump({'0th': {}, 'GPS': gps})
+        self._assert_matches_piexif(exif_bytes)
+
+        path = self._write('zero.jpg', _jpeg_bytes(exif=exif_bytes))
+        with self.assertLogs(level='WARNING'):
+            metadata = extract_exif_data(path)
+        self.assertIsNone(metadata['location'])
+
+    def test_extract_location(self):
+        exif_bytes = piexif.dump({'0th': {0x0132: b'2024:05:06 07:08:09'}, 'GPS': _GPS_IFD})
+        path = self._write('gps.jpg', _jpeg_bytes(exif=exif_bytes))
+        metadata = extract_exif_data(path, filename='gps')
+        self.assertEqual(metadata['datetime'], '2024:05:06 07:08:09')
+        self.assertAlmostEqual(metadata['latitude'], 52 + 31 / 60 + 12.5 / 3600)
+        self.assertAlmostEqual(metadata['longitude'], 13 + 24 / 60 + 3 / 3600)
+        self.assertAlmostEqual(metadata['altitude'], 34.5)
+        self.assertAlmostEqual(metadata['direction'], 123.4)
+
+    def test_png_renamed_to_jpg(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (4, 4)).save(buffer, 'PNG')
+        path = self._write('png.jpg', buffer.getvalue())
+        with self.assertRaises(ValueError):
+            _load_exif_tags(path)
+        with self.assertLogs(level='WARNING'):
+            metadata = extract_exif_data(path)
+        self.assertIsNone(metadata['datetime'])
+        self.assertIsNone(metadata['location'])
+
+    def test_empty_file(self):
+        path = self._write('empty.jpg', b'')
+        with self.assertRaises(ValueError):
+            _load_exif_tags(path)
+        with self.assertLogs(level='WARNING'):
+            metadata = extract_exif_data(path)
+        self.assertIsNone(metadata['location'])
+
+    def test_no_exif(self):
+        path = self._write('plain.jpg', _jpeg_bytes())
+        self.assertEqual(_load_exif_tags(path), {})
+        self.assertEqual(parse_exif_bytes(None), {})
+
+
+if __name__ == '__main__':
+    unittest.main()